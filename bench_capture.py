@@ -0,0 +1,88 @@
+r"""Measure bytes allocated per recorded command, old path vs capture buffers.
+
+No microphone is needed: ``sounddevice.rec`` is replaced by a stand-in that
+behaves like the real call (allocate a float32 array, or fill ``out=`` in
+place), so the numbers reflect only what the recording code allocates.
+Allocations are measured with tracemalloc, which numpy reports into.
+
+Usage:
+    python bench_capture.py
+    python bench_capture.py --duration 4 --commands 20
+"""
+from __future__ import annotations
+import argparse
+import tracemalloc
+
+import numpy as np
+
+import capture
+
+
+class FakeSoundDevice:
+    """Minimal stand-in for the parts of sounddevice that recording uses."""
+
+    @staticmethod
+    def rec(frames=None, samplerate=None, channels=None, dtype="float32", out=None):
+        if out is not None:
+            out.fill(1)
+            return out
+        return np.full((frames, channels), 0.5, dtype=dtype)
+
+    @staticmethod
+    def wait():
+        pass
+
+
+def legacy_record(duration: float, fs: int) -> np.ndarray:
+    """The pre-capture.py record_command body (minus the WAV write)."""
+    recording = capture.sd.rec(int(duration * fs), samplerate=fs, channels=1)
+    capture.sd.wait()
+    return (recording * 32767).astype(np.int16)
+
+
+def buffered_record(duration: float, fs: int) -> np.ndarray:
+    return capture.get_capture_buffer(fs).record(duration)
+
+
+def measure(fn, duration: float, fs: int, n: int) -> tuple:
+    """Return (bytes allocated per command, peak bytes) over ``n`` commands.
+
+    One warm-up call runs first so one-off buffer creation isn't counted
+    against every command.
+    """
+    fn(duration, fs)
+    tracemalloc.start()
+    total = 0
+    peak = 0
+    for _ in range(n):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        result = fn(duration, fs)
+        _, call_peak = tracemalloc.get_traced_memory()
+        total += call_peak - before
+        peak = max(peak, call_peak - before)
+        del result
+    tracemalloc.stop()
+    return total / n, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=4.0, help="Seconds per command")
+    parser.add_argument("--commands", type=int, default=10, help="Number of commands to simulate")
+    args = parser.parse_args()
+
+    capture.sd = FakeSoundDevice()
+    rows = [
+        ("before: sd.rec float32 @ 44100 Hz + scale + int16 cast", legacy_record, 44100),
+        ("before: same path @ 16000 Hz", legacy_record, capture.DEFAULT_SAMPLE_RATE),
+        ("after: CaptureBuffer int16 @ 16000 Hz", buffered_record, capture.DEFAULT_SAMPLE_RATE),
+    ]
+    print(f"{args.commands} commands x {args.duration}s")
+    for label, fn, fs in rows:
+        per_call, peak = measure(fn, args.duration, fs, args.commands)
+        print(f"  {label:<56} {per_call / 1024:>10.1f} KiB/command  (peak {peak / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
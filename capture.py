@@ -0,0 +1,92 @@
+"""Preallocated audio capture buffers for main.py.
+
+``sd.rec`` normally allocates a fresh float32 array per call, which
+record_command then scaled and cast to int16 (two more arrays). Here audio is
+recorded straight into a reusable int16 buffer at the transcription model's
+native rate, so a steady stream of commands allocates nothing per call once
+the buffer exists.
+
+Arrays returned by ``CaptureBuffer.record()`` and ``view()`` are views into
+the shared buffer: they are only valid until the next ``record()`` call.
+Copy them if they need to outlive that.
+
+main.py still hands audio to transcription as a temporary WAV file, written
+directly from the buffer view. That handoff is deliberate: the OpenAI backend
+uploads a file, and local Whisper decodes its input through ffmpeg. ``view()``
+and ``memoryview()`` are there for in-process consumers that can take samples
+directly.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Dict, Tuple
+
+import numpy as np
+
+try:
+    import sounddevice as sd
+except Exception:
+    sd = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_RATE = 16000  # Whisper's native rate; avoids resampling later
+DEFAULT_MAX_SECONDS = 8.0
+DEFAULT_DTYPE = "int16"  # what the WAV writer and transcription backends consume
+
+
+class CaptureBuffer:
+    """A reusable recording buffer with a fixed sample rate, channel count and dtype."""
+
+    def __init__(self, fs: int = DEFAULT_SAMPLE_RATE, max_seconds: float = DEFAULT_MAX_SECONDS,
+                 channels: int = 1, dtype: str = DEFAULT_DTYPE):
+        self.fs = int(fs)
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self._buf = np.zeros((int(max_seconds * self.fs), channels), dtype=self.dtype)
+        self.frames = 0
+
+    @property
+    def capacity(self) -> int:
+        """Number of frames the buffer can hold without reallocating."""
+        return self._buf.shape[0]
+
+    def ensure_capacity(self, nframes: int) -> None:
+        """Grow the buffer if a recording of ``nframes`` would not fit."""
+        if nframes > self.capacity:
+            logger.info("Growing capture buffer from %d to %d frames", self.capacity, nframes)
+            self._buf = np.zeros((nframes, self.channels), dtype=self.dtype)
+
+    def record(self, duration: float) -> np.ndarray:
+        """Record ``duration`` seconds into the buffer and return a view of it."""
+        if sd is None:
+            raise RuntimeError("sounddevice is not installed. Install it with: pip install sounddevice")
+        nframes = int(duration * self.fs)
+        self.ensure_capacity(nframes)
+        out = self._buf[:nframes]
+        # With out= sounddevice fills our array in place using its dtype and
+        # channel count, so no intermediate float32 array is created.
+        sd.rec(out=out, samplerate=self.fs)
+        sd.wait()
+        self.frames = nframes
+        return out
+
+    def view(self) -> np.ndarray:
+        """Zero-copy view of the most recent recording, shape (frames, channels)."""
+        return self._buf[:self.frames]
+
+    def memoryview(self) -> memoryview:
+        """Zero-copy buffer-protocol view of the most recent recording."""
+        return memoryview(self.view())
+
+
+_buffers: Dict[Tuple[int, int], CaptureBuffer] = {}
+
+
+def get_capture_buffer(fs: int = DEFAULT_SAMPLE_RATE, channels: int = 1) -> CaptureBuffer:
+    """Return the shared capture buffer for this rate/channel count, creating it on first use."""
+    key = (int(fs), channels)
+    buf = _buffers.get(key)
+    if buf is None:
+        buf = _buffers[key] = CaptureBuffer(fs=fs, channels=channels)
+    return buf
@@ -1,4 +1,3 @@
- HEAD
 commands = {
     "what is the altitude": "Altitude is 15000 feet",
     "what is our speed": "Current speed is 450 knots",
@@ -16,21 +15,14 @@ commands = {
     "flaps down": "Flaps lowered",
     "flaps up": "Flaps raised"
 }
-commands = {
-    "what is the altitude": "Altitude is 15000 feet",
-    "what is our speed": "Current speed is 450 knots",
-    "weather status": "Weather is clear with light turbulence",
-    "fuel level": "Fuel remaining is 62 percent",
-    "landing gear down": "Landing gear deployed",
-    "landing gear up": "Landing gear retracted",
-    "increase altitude": "Climbing to higher altitude",
-    "decrease altitude": "Descending to lower altitude",
-    "turn left ten degrees": "Turning left by 10 degrees",
-    "turn right ten degrees": "Turning right by 10 degrees",
-    "activate autopilot": "Autopilot activated",
-    "deactivate autopilot": "Autopilot deactivated",
-    "engine status": "Engines running normal",
-    "flaps down": "Flaps lowered",
-    "flaps up": "Flaps raised"
+
+# Status intents answered from live telemetry (see telemetry.py):
+# phrase -> (telemetry field, response template). Without a fresh sample for
+# the field these answer "Telemetry unavailable"; the static strings above are
+# only used for phrases not listed here.
+telemetry_commands = {
+    "what is the altitude": ("altitude_ft", "Altitude is {:.0f} feet"),
+    "what is our speed": ("speed_kt", "Current speed is {:.0f} knots"),
+    "fuel level": ("fuel_pct", "Fuel remaining is {:.0f} percent"),
+    "engine status": ("engine_state", "Engines {}"),
 }
- 57d5769 (Add copilot instructions and improve dashboard match display)
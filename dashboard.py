@@ -1,9 +1,12 @@
+import os
 import re
 from difflib import SequenceMatcher
 
 import streamlit as st
 import speech_recognition as sr
 from commands import commands   # IMPORT
+import profiler
+import telemetry
 
 
 st.set_page_config(page_title="Voice Aircraft Control", page_icon="🎙", layout="centered")
@@ -12,16 +15,36 @@ st.markdown("<h1 style='text-align:center;color:white;'>🎙 Voice Command Dashb
 st.write("")
 
 
+# HIDDEN PROFILER CONTROL
+# Only shown with DASHBOARD_PROFILE=1 or ?profile=1 in the URL. The profiler
+# samples every thread, so a window spanning a few reruns captures them too.
+if os.environ.get("DASHBOARD_PROFILE") == "1" or st.query_params.get("profile") == "1":
+    with st.sidebar.expander("Profiler"):
+        prof = profiler.get_profiler()
+        window = st.number_input("Window (seconds)", min_value=1.0, max_value=300.0, value=profiler.DEFAULT_WINDOW)
+        if prof.is_running:
+            st.info(f"Sampling... {prof.sample_count} samples so far")
+            if st.session_state.get("profile_path"):
+                st.caption(f"Writing to {st.session_state['profile_path']}")
+        elif st.button("Start sampling"):
+            st.session_state["profile_path"] = profiler.profile_window(window)
+            st.info(f"Sampling for {window:.0f}s into {st.session_state['profile_path']}")
+        elif st.session_state.get("profile_path"):
+            st.caption(f"Last profile: {st.session_state['profile_path']}")
+
+
 # COMMAND LOGIC
 def aircraft_response(text: str):
-    """Return a tuple (matched_key, response) for the given transcript.
+    """Return a tuple (matched_key, response, age) for the given transcript.
 
     - If an explicit phrase from `commands` is found as a substring of the
-      cleaned transcript, return (phrase, response_string).
-    - Otherwise return (None, "⚠️ Command Not Recognized").
+      cleaned transcript, return (phrase, response_string, age). Status
+      phrases bound to telemetry are answered from the live response cache
+      and `age` is the answer's age in seconds; otherwise `age` is None.
+    - Otherwise return (None, "⚠️ Command Not Recognized", None).
 
-    The UI expects a tuple so it can display both the matched phrase and the
-    textual response. This keeps behavior explicit for confirmed suggestions
+    The UI expects a tuple so it can display the matched phrase, the
+    textual response and, for live answers, how old they are. This keeps behavior explicit for confirmed suggestions
     and exact matches.
     """
     text = (text or "").lower()
@@ -29,10 +52,11 @@ def aircraft_response(text: str):
     # Prefer explicit commands defined in commands.py
     for key in commands:
         if key in text:
-            return key, commands[key]
+            response, age = telemetry.get_response_cache().respond(key)
+            return key, response, age
 
     # No explicit command found — signal unrecognized so the UI can retry
-    return None, "⚠️ Command Not Recognized"
+    return None, "⚠️ Command Not Recognized", None
 
 
 def safe_rerun():
@@ -179,14 +203,16 @@ if "speech_text" in st.session_state:
     st.subheader("Your Speech Text:")
     st.write(st.session_state["speech_text"])
 
-    # RESPONSE (now returns matched_key, response_text)
-    matched_key, response = aircraft_response(st.session_state["speech_text"])
+    # RESPONSE (returns matched_key, response_text, telemetry age)
+    matched_key, response, age = aircraft_response(st.session_state["speech_text"])
 
     st.subheader("Aircraft Response:")
     # If we have an explicit match show a stronger visual affordance and the
     # canonical phrase that matched.
     if matched_key:
         st.success(f"{matched_key} → {response}")
+        if age is not None:
+            st.caption(f"Live telemetry, {age:.1f}s old")
     else:
         st.success(response)
 
@@ -1,69 +1,19 @@
-HEAD
-import os, shutil
-FFMPEG_BIN = r"C:\Users\seeke\Downloads\ffmpeg-2025-11-02-git-f5eb11a71d-essentials_build\ffmpeg-2025-11-02-git-f5eb11a71d-essentials_build\bin"
-os.environ["PATH"] += os.pathsep + FFMPEG_BIN
-print("ffmpeg path:", shutil.which("ffmpeg") or "NOT FOUND")
-
-import sounddevice as sd
-from scipy.io.wavfile import write
-import whisper
-from commands import commands
-import re
-
-print("Testing audio device...")
-print(sd.query_devices())
-
-fs = 44100  # sample rate
-
-print("Recording..... Speak your command")
-duration = 4  # seconds
-recording = sd.rec(int(duration * fs), samplerate=fs, channels=1)
-sd.wait()
-write("cmd.wav", fs, recording)
-
-print("Converting speech to text...")
-model = whisper.load_model("base")
-result = model.transcribe("cmd.wav")
-text = result["text"].lower()
-print("You said:", text)
-
-# command matching
-matched = False
-clean_text = re.sub(r'[^a-zA-Z ]', '', text)
-
-for phrase in commands:
-    if phrase in clean_text:
-        print("Cockpit Response:", commands[phrase])
-        matched = True
-        break
-
-if not matched:
-    print("Command not recognized. Try speaking clearer.")
-
 import os
 import shutil
 import tempfile
 import logging
-import numpy as np
 from scipy.io.wavfile import write
 
 # Optional imports - we import inside try blocks to provide helpful errors
-try:
-    import sounddevice as sd
-except Exception:
-    sd = None
-
 try:
     import whisper
 except Exception:
     whisper = None
 
-try:
-    import xpc
-except Exception:
-    xpc = None
-
 from commands import commands
+import capture
+import profiler
+import telemetry
 import re
 import argparse
 import sys
@@ -106,29 +56,21 @@ def ensure_ffmpeg_on_path():
     logger.warning("ffmpeg not found on PATH. Some audio backends or transcription models may need ffmpeg installed.")
 
 
-def record_command(duration=4, fs=44100):
+def record_command(duration=4, fs=capture.DEFAULT_SAMPLE_RATE):
     """Record audio from the default input device and return the filename.
 
-    Writes a temporary WAV file and returns its path. Caller should remove it.
+    Audio is captured as int16 straight into a reused buffer (see capture.py),
+    so repeated commands don't allocate new sample arrays. The buffer view is
+    still handed on as a temporary WAV file because the OpenAI backend uploads
+    a file and local Whisper decodes one through ffmpeg. Returns the WAV path;
+    the caller should remove it.
     """
-    if sd is None:
-        raise RuntimeError("sounddevice is not installed. Install it with: pip install sounddevice")
-
     logger.info("Recording for %s seconds (fs=%s)", duration, fs)
     try:
-        recording = sd.rec(int(duration * fs), samplerate=fs, channels=1)
-        sd.wait()
+        data = capture.get_capture_buffer(fs).record(duration)
     except Exception as e:
         raise RuntimeError(f"Failed to record audio: {e}") from e
 
-    # Convert float32 [-1,1] to int16 for WAV
-    data = recording
-    try:
-        data = (data * 32767).astype(np.int16)
-    except Exception:
-        # fallback: attempt to coerce
-        data = np.asarray(data).astype(np.int16)
-
     tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
     tmp_name = tmp.name
     tmp.close()
@@ -192,19 +134,21 @@ def transcribe_file(wav_path: str, backend: str = "openai", model_name: Optional
         raise ValueError(f"Unknown transcription backend: {backend}")
 
 
-def query_xplane_altitude():
-    if xpc is None:
-        logger.warning("XPlaneConnect (xpc) not installed. Skipping X-Plane position query.")
-        return None
-    try:
-        with xpc.XPlaneConnect() as client:
-            posi = client.getPOSI()
-            altitude_m = posi[2]
-            logger.info("X-Plane altitude: %s m", altitude_m)
-            return altitude_m
-    except Exception as e:
-        logger.warning("Failed to query X-Plane: %s", e)
-        return None
+def print_altitude(responses):
+    """Print the latest altitude from the telemetry cache, if it has a fresh one."""
+    latest = responses.latest("altitude_ft")
+    if latest is not None:
+        altitude_ft, age = latest
+        print(f"Altitude: {altitude_ft:.0f} ft (telemetry {age:.1f}s old)")
+
+
+def print_response(responses, phrase):
+    """Print the cockpit response for a matched phrase, with its age if it is live."""
+    text, age = responses.respond(phrase)
+    if age is None:
+        print("Cockpit Response:", text)
+    else:
+        print("Cockpit Response:", text, f"(telemetry {age:.1f}s old)")
 
 
 def best_command_match(text, commands_dict, min_ratio=0.45):
@@ -231,6 +175,9 @@ def best_command_match(text, commands_dict, min_ratio=0.45):
 
 def main():
     ensure_ffmpeg_on_path()
+    # Start sampling telemetry now so status answers are ready by the time
+    # recording and transcription finish.
+    responses = telemetry.get_response_cache()
 
     try:
         wav = record_command()
@@ -253,13 +200,11 @@ def main():
     if text:
         print("You said:", text)
 
-    altitude_m = query_xplane_altitude()
-    if altitude_m is not None:
-        print(f"Altitude: {altitude_m} m")
+    print_altitude(responses)
 
     matched_key, score = best_command_match(text, commands)
     if matched_key:
-        print("Cockpit Response:", commands[matched_key])
+        print_response(responses, matched_key)
     else:
         print("Command not recognized. Try speaking clearer.")
 
@@ -268,16 +213,22 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Record a short audio clip, transcribe with Whisper, and match commands.")
     parser.add_argument("--model", help="Whisper model to use (tiny, base, etc.). If omitted, WHISPER_MODEL env var or 'tiny' is used.")
     parser.add_argument("--duration", type=float, default=4.0, help="Recording duration in seconds")
+    parser.add_argument("--sample-rate", type=int, default=capture.DEFAULT_SAMPLE_RATE, help="Recording sample rate in Hz (default 16000, Whisper's native rate)")
     parser.add_argument("--backend", choices=["openai", "whisper"], help="Transcription backend to use (openai or whisper). Defaults to TRANSCRIBE_BACKEND env or 'openai'.")
     parser.add_argument("--debug", action="store_true", help="Show debug info (cleaned transcript, best match and score)")
+    parser.add_argument("--profile", nargs="?", const="", metavar="PATH", help="Sample stacks for the whole run and write collapsed-stack (flamegraph) output to PATH (default: profile-<timestamp>-<pid>.collapsed)")
     args = parser.parse_args()
 
+    # SIGUSR1 starts a timed profiling window on POSIX; a no-op on Windows.
+    profiler.install_signal_trigger()
+
     # Allow passing model via CLI; otherwise transcribe_file will use env or default
     def main_with_args():
         ensure_ffmpeg_on_path()
+        responses = telemetry.get_response_cache()
 
         try:
-            wav = record_command(duration=args.duration)
+            wav = record_command(duration=args.duration, fs=args.sample_rate)
         except Exception as e:
             logger.error("Recording failed: %s", e)
             return
@@ -312,9 +263,7 @@ if __name__ == '__main__':
         if text:
             print("You said:", text)
 
-        altitude_m = query_xplane_altitude()
-        if altitude_m is not None:
-            print(f"Altitude: {altitude_m} m")
+        print_altitude(responses)
 
         # For debugging/suggestion, get best match without enforcing threshold
         best_key, best_score = best_command_match(text, commands, min_ratio=0.0)
@@ -324,9 +273,10 @@ if __name__ == '__main__':
             clean_text = re.sub(r'[^a-zA-Z ]', ' ', text).strip()
             print("[DEBUG] cleaned transcript:", repr(clean_text))
             print(f"[DEBUG] best match: {best_key!r} score={best_score:.3f}")
+            print(f"[DEBUG] telemetry refresh every {responses.interval:.2f}s, answers expire after {telemetry.STALE_AFTER * responses.max_staleness:.2f}s")
 
         if accepted and best_key:
-            print("Cockpit Response:", commands[best_key])
+            print_response(responses, best_key)
         else:
             if best_key:
                 # Interactive confirmation if running in a terminal
@@ -336,7 +286,7 @@ if __name__ == '__main__':
                     msg += f"\nDid you mean '{suggestion}'? [y/N]: "
                     resp = input(msg)
                     if resp.strip().lower().startswith('y'):
-                        print("Cockpit Response:", commands[suggestion])
+                        print_response(responses, suggestion)
                     else:
                         print("OK — command not executed. Try speaking clearer or add the phrase to commands.py.")
                 else:
@@ -344,6 +294,14 @@ if __name__ == '__main__':
             else:
                 print("Command not recognized. Try speaking clearer.")
 
-    main_with_args()
-
- 57d5769 (Add copilot instructions and improve dashboard match display)
+    if args.profile is not None:
+        prof = profiler.get_profiler()
+        prof.start()
+        try:
+            main_with_args()
+        finally:
+            prof.stop()
+            out = prof.write_collapsed(args.profile or profiler.default_output_path())
+            print(f"Profile written to {out} ({prof.sample_count} samples)")
+    else:
+        main_with_args()
@@ -0,0 +1,201 @@
+"""Low-overhead sampling profiler for the CLI and the dashboard.
+
+A background thread periodically snapshots the Python stacks of every other
+thread (via ``sys._current_frames()``) and counts identical stacks. Nothing
+is installed or running until a profiling window is started, so the cost
+when profiling is off is a single module import.
+
+Output is written in the "collapsed stack" format understood by
+``flamegraph.pl``, speedscope and inferno: one ``frame;frame;frame count``
+line per unique stack, root first.
+
+Ways to trigger a window:
+  - ``python main.py --profile [PATH]`` profiles the whole CLI run.
+  - On POSIX, ``kill -USR1 <pid>`` starts a timed window in a running
+    process that called ``install_signal_trigger()``.
+  - The dashboard shows a hidden "Profiler" control when started with
+    ``DASHBOARD_PROFILE=1`` or opened with ``?profile=1`` in the URL.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 0.005  # seconds between samples (~200 Hz)
+DEFAULT_WINDOW = 10.0  # seconds for signal/dashboard triggered windows
+DEFAULT_OUTPUT_DIR = os.environ.get("PROFILE_DIR", ".")
+
+# Stacks whose innermost frame sits in one of these files are threads parked
+# on a lock, queue or selector. They dominate long-running processes such as
+# the Streamlit server but say nothing about where CPU goes.
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Sample thread stacks at a fixed interval and aggregate them.
+
+    Only one window can be active at a time; ``start()`` while running is a
+    no-op. Samples accumulate across windows until ``reset()`` is called.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started_at: Optional[float] = None
+        self.deadline: Optional[float] = None
+        self.output: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: Optional[float] = None, output: Optional[str] = None,
+              reset: bool = False) -> bool:
+        """Start sampling. If ``duration`` is given, stop automatically after it.
+
+        With ``output``, the collapsed stacks are written there when the
+        window ends. ``reset`` clears earlier samples, but only if this call
+        actually starts a window. Returns False if a window is already running.
+        """
+        with self._lock:
+            if self.is_running:
+                return False
+            if reset:
+                self.reset()
+            self.output = output
+            self._stop.clear()
+            self.started_at = time.monotonic()
+            self.deadline = self.started_at + duration if duration else None
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        logger.info("Sampling profiler started (interval=%ss, window=%s)", self.interval, duration or "until stopped")
+        return True
+
+    def stop(self) -> Counter:
+        """Stop sampling and return the aggregated stack counts."""
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            if thread is not threading.current_thread():
+                thread.join()
+        self._thread = None
+        return self.samples
+
+    def reset(self) -> None:
+        self.samples = Counter()
+        self.sample_count = 0
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                break
+            frames = sys._current_frames()
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                if not self.include_idle and frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                stack.reverse()
+                self.samples[";".join(stack)] += 1
+            self.sample_count += 1
+            del frames
+        logger.info("Sampling profiler stopped after %d samples", self.sample_count)
+        if self.output:
+            try:
+                self.write_collapsed(self.output)
+            except OSError as e:
+                logger.warning("Failed to write profile to %s: %s", self.output, e)
+
+    def write_collapsed(self, path: str) -> str:
+        """Write the collected stacks in collapsed-stack format and return the path."""
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, count in self.samples.most_common():
+                fh.write(f"{stack} {count}\n")
+        logger.info("Wrote %d unique stacks to %s", len(self.samples), path)
+        return path
+
+
+_profiler: Optional[SamplingProfiler] = None
+
+
+def get_profiler() -> SamplingProfiler:
+    """Return the process-wide profiler, creating it on first use.
+
+    Streamlit re-executes ``dashboard.py`` on every interaction but keeps
+    imported modules, so this instance survives reruns.
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = SamplingProfiler()
+    return _profiler
+
+
+def default_output_path(prefix: str = "profile") -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(DEFAULT_OUTPUT_DIR, f"{prefix}-{stamp}-{os.getpid()}.collapsed")
+
+
+def profile_window(duration: float = DEFAULT_WINDOW, path: Optional[str] = None) -> Optional[str]:
+    """Sample for ``duration`` seconds in the background, then write the result.
+
+    Returns the output path, or None if a window is already running.
+    """
+    out = path or default_output_path()
+    if not get_profiler().start(duration, output=out, reset=True):
+        return None
+    return out
+
+
+def install_signal_trigger(signum: Optional[int] = None, duration: float = DEFAULT_WINDOW) -> bool:
+    """Start a profiling window whenever the process receives ``signum``.
+
+    Defaults to SIGUSR1. Returns False where the signal is unavailable
+    (e.g. Windows) or when not called from the main thread.
+    """
+    if signum is None:
+        signum = getattr(signal, "SIGUSR1", None)
+    if signum is None:
+        return False
+
+    def _start_window():
+        out = profile_window(duration)
+        if out:
+            logger.info("Signal received: profiling for %ss into %s", duration, out)
+
+    def _handler(_signum, _frame):
+        # Signal handlers run on the main thread, which may already hold the
+        # profiler lock (e.g. inside start()), so only hand the work off here.
+        threading.Thread(target=_start_window, name="profile-trigger", daemon=True).start()
+
+    try:
+        signal.signal(signum, _handler)
+    except ValueError:
+        return False
+    return True
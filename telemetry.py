@@ -0,0 +1,239 @@
+"""Precomputed status answers refreshed from live telemetry.
+
+Status intents ("what is the altitude", "fuel level", ...) are bound to
+telemetry fields in ``commands.telemetry_commands``. A ``ResponseCache``
+polls a telemetry source on a background thread and re-renders every bound
+answer after each sample, so a matched query is answered with a dict lookup
+instead of a telemetry round trip after the match.
+
+Every answer carries the monotonic time of the sample it came from. The
+timestamp is taken before the fetch starts, so ``now - sampled_at`` is an
+upper bound on how old the data behind the answer is. Answers older than
+``STALE_AFTER`` times ``max_staleness`` (e.g. because the simulator dropped)
+are not served.
+
+Sources are plain callables returning a dict of field -> value. Fields a
+source cannot provide are simply left out. A bound intent with no live
+answer, whether never sampled or expired, reports ``TELEMETRY_UNAVAILABLE``;
+only phrases not in ``telemetry_commands`` use the static strings in
+``commands.commands``.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import xpc
+except Exception:
+    xpc = None
+
+from commands import commands, telemetry_commands
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 0.5  # seconds between telemetry samples
+STALE_AFTER = 3  # answers older than this many max_staleness periods expire
+FAILURE_LOG_INTERVAL = 30.0  # seconds between repeated fetch-failure warnings
+TELEMETRY_UNAVAILABLE = "Telemetry unavailable"
+METERS_TO_FEET = 3.28084
+
+# X-Plane datarefs read by xplane_source(), in this order.
+XPLANE_DREFS = [
+    "sim/flightmodel/position/indicated_airspeed",  # knots
+    "sim/flightmodel/weight/m_fuel_total",  # kg on board
+    "sim/aircraft/weight/acf_m_fuel_tot",  # kg capacity
+    "sim/aircraft/engine/acf_num_engines",  # engines fitted to the aircraft
+    "sim/flightmodel/engine/ENGN_running",  # 0/1 for every engine slot (8 or 16), used or not
+]
+
+
+def xplane_source() -> Dict[str, object]:
+    """Read altitude, speed, fuel and engine state from X-Plane via XPlaneConnect."""
+    if xpc is None:
+        raise RuntimeError("XPlaneConnect (xpc) is not installed")
+    with xpc.XPlaneConnect() as client:
+        posi = client.getPOSI()
+        speed, fuel, fuel_max, num_engines, engines = client.getDREFs(XPLANE_DREFS)
+    sample = {
+        "altitude_ft": posi[2] * METERS_TO_FEET,
+        "speed_kt": speed[0],
+    }
+    if fuel_max and fuel_max[0] > 0:
+        sample["fuel_pct"] = 100.0 * fuel[0] / fuel_max[0]
+    if num_engines:
+        engines = engines[:int(num_engines[0])]
+    if engines:
+        running = sum(1 for e in engines if e)
+        if running == len(engines):
+            sample["engine_state"] = "running normal"
+        elif running:
+            sample["engine_state"] = f"partially running ({running} of {len(engines)})"
+        else:
+            sample["engine_state"] = "shut down"
+    return sample
+
+
+def file_source(base: Optional[Path] = None) -> Callable[[], Dict[str, object]]:
+    """Return a source reading the altitude.txt/speed.txt files next to the dashboard."""
+    base = base or Path(__file__).resolve().parent
+    files = {"altitude_ft": "altitude.txt", "speed_kt": "speed.txt"}
+
+    def read() -> Dict[str, object]:
+        sample = {}
+        for field, name in files.items():
+            try:
+                sample[field] = float((base / name).read_text(encoding="utf-8").strip())
+            except (OSError, ValueError):
+                continue
+        return sample
+
+    return read
+
+
+def default_source() -> Callable[[], Dict[str, object]]:
+    """X-Plane when XPlaneConnect is installed, otherwise the example text files."""
+    return xplane_source if xpc is not None else file_source()
+
+
+class ResponseCache:
+    """Keep rendered answers for telemetry-bound intents fresh in memory.
+
+    ``answers`` is replaced wholesale after each sample, so readers never need
+    a lock and never see a half-updated set of answers.
+    """
+
+    def __init__(self, source: Callable[[], Dict[str, object]], interval: float = DEFAULT_REFRESH_INTERVAL,
+                 bindings: Optional[Dict[str, Tuple[str, str]]] = None):
+        self.source = source
+        self.interval = interval
+        self.bindings = telemetry_commands if bindings is None else bindings
+        self.answers: Dict[str, Tuple[str, float]] = {}
+        self.sample: Tuple[Dict[str, object], float] = ({}, 0.0)
+        self.last_fetch_duration = 0.0
+        self._failures = 0
+        self._last_failure_log: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def max_staleness(self) -> float:
+        """Expected worst-case answer age while the refresher is healthy."""
+        return self.interval + self.last_fetch_duration
+
+    def _is_expired(self, age: float) -> bool:
+        return age > STALE_AFTER * self.max_staleness
+
+    def refresh(self) -> bool:
+        """Take one telemetry sample and re-render bound answers. Returns False on failure."""
+        sampled_at = time.monotonic()
+        try:
+            sample = self.source()
+        except Exception as e:
+            self._failures += 1
+            if self._last_failure_log is None or sampled_at - self._last_failure_log >= FAILURE_LOG_INTERVAL:
+                logger.warning("Telemetry fetch failed (%d failure(s) since last success): %s", self._failures, e)
+                self._last_failure_log = sampled_at
+            return False
+        if self._failures:
+            logger.info("Telemetry recovered after %d failed fetch(es)", self._failures)
+            self._failures = 0
+            self._last_failure_log = None
+        self.last_fetch_duration = time.monotonic() - sampled_at
+        self.sample = (sample, sampled_at)
+
+        answers = dict(self.answers)
+        for phrase, (field, template) in self.bindings.items():
+            if sample.get(field) is None:
+                continue
+            try:
+                answers[phrase] = (template.format(sample[field]), sampled_at)
+            except (ValueError, TypeError) as e:
+                logger.debug("Cannot render %r from %s=%r: %s", phrase, field, sample[field], e)
+        self.answers = answers
+        return True
+
+    def start(self) -> bool:
+        """Start refreshing in the background. Returns False if already running."""
+        if self.is_running:
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry-refresh", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            self.refresh()
+            if self._stop.wait(self.interval):
+                break
+
+    def answer(self, phrase: str) -> Optional[Tuple[str, float]]:
+        """Return (response, age in seconds) for a telemetry-bound phrase.
+
+        Returns None if there is no answer or it has expired.
+        """
+        entry = self.answers.get(phrase)
+        if entry is None:
+            return None
+        text, sampled_at = entry
+        age = time.monotonic() - sampled_at
+        if self._is_expired(age):
+            return None
+        return text, age
+
+    def latest(self, field: str) -> Optional[Tuple[object, float]]:
+        """Return (value, age in seconds) of a field from the last sample, or None if missing or expired."""
+        sample, sampled_at = self.sample
+        value = sample.get(field)
+        if value is None:
+            return None
+        age = time.monotonic() - sampled_at
+        if self._is_expired(age):
+            return None
+        return value, age
+
+    def respond(self, phrase: str) -> Tuple[str, Optional[float]]:
+        """Return (response, age) for any command phrase.
+
+        Telemetry-bound phrases with a live answer return it and its age.
+        Bound phrases without one (never sampled or expired) return
+        ``TELEMETRY_UNAVAILABLE`` rather than a stale or made-up value.
+        Everything else returns the static response and None.
+        """
+        live = self.answer(phrase)
+        if live is not None:
+            return live
+        if phrase in self.bindings:
+            return TELEMETRY_UNAVAILABLE, None
+        return commands[phrase], None
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide cache, creating and starting it on first use.
+
+    ``TELEMETRY_REFRESH`` overrides the refresh interval in seconds.
+    """
+    global _cache
+    if _cache is None:
+        interval = float(os.environ.get("TELEMETRY_REFRESH", DEFAULT_REFRESH_INTERVAL))
+        _cache = ResponseCache(default_source(), interval=interval)
+        _cache.start()
+    return _cache